@@ -16,9 +16,10 @@
 
 /**
  * Bán kính Trái Đất (km)
- * Sử dụng mean radius theo IUGG (International Union of Geodesy and Geophysics)
+ * Sử dụng mean radius R₁ theo IUGG (International Union of Geodesy and Geophysics)
+ * cho ellipsoid WGS-84: R₁ = (2a + b) / 3 = 6371.0088 km
  */
-const EARTH_RADIUS_KM = 6371.0;
+const EARTH_RADIUS_KM = 6371.0088;
 
 /**
  * Hệ số chuyển đổi giữa Degrees và Radians
@@ -26,6 +27,31 @@ const EARTH_RADIUS_KM = 6371.0;
 const DEG_TO_RAD = Math.PI / 180;
 const RAD_TO_DEG = 180 / Math.PI;
 
+/**
+ * Bảng tra sin/cos cho azimuth nguyên độ (0° - 360°)
+ * 
+ * Góc ngắm thường được nhập theo độ nguyên (0, 45, 90...), nên
+ * calculateTargetCoordinate tra bảng thay vì gọi Math.sin/Math.cos.
+ * Góc lẻ vẫn tính trực tiếp.
+ */
+const AZIMUTH_SIN_TABLE = new Float64Array(361);
+const AZIMUTH_COS_TABLE = new Float64Array(361);
+
+for (let deg = 0; deg <= 360; deg++) {
+  AZIMUTH_SIN_TABLE[deg] = Math.sin(deg * DEG_TO_RAD);
+  AZIMUTH_COS_TABLE[deg] = Math.cos(deg * DEG_TO_RAD);
+}
+
+// Hướng chính (N/E/S/W): dùng giá trị chính xác 0/±1 thay vì kết quả libm
+// (ví dụ Math.sin(Math.PI) = 1.22e-16), để bảng khớp đúng công thức dạng đóng.
+// Ảnh hưởng lên tọa độ chỉ cỡ 1e-20 rad — sai số làm tròn còn lại của kinh độ
+// (ví dụ 106.660172 → 106.66017199999999) đến từ bước normalize kinh độ.
+for (let deg = 0; deg <= 360; deg += 90) {
+  const quadrant = (deg / 90) % 4;
+  AZIMUTH_SIN_TABLE[deg] = [0, 1, 0, -1][quadrant];
+  AZIMUTH_COS_TABLE[deg] = [1, 0, -1, 0][quadrant];
+}
+
 /**
  * Giới hạn tọa độ
  */
@@ -36,6 +62,27 @@ const LON_MAX = 180;
 const AZIMUTH_MIN = 0;
 const AZIMUTH_MAX = 360;
 
+/**
+ * Khoảng cách tối đa (km) còn giữ được độ chính xác trên mô hình cầu
+ */
+const MAX_DISTANCE_KM = 100;
+
+/**
+ * Bảng hướng (cardinal directions) dùng cho formatAzimuth
+ * Khởi tạo một lần khi load module thay vì mỗi lần format
+ */
+const CARDINAL_DIRECTIONS = Object.freeze([
+  { angle: 0, short: 'N', full: 'Bắc' },
+  { angle: 45, short: 'NE', full: 'Đông Bắc' },
+  { angle: 90, short: 'E', full: 'Đông' },
+  { angle: 135, short: 'SE', full: 'Đông Nam' },
+  { angle: 180, short: 'S', full: 'Nam' },
+  { angle: 225, short: 'SW', full: 'Tây Nam' },
+  { angle: 270, short: 'W', full: 'Tây' },
+  { angle: 315, short: 'NW', full: 'Tây Bắc' },
+  { angle: 360, short: 'N', full: 'Bắc' }
+]);
+
 // ==================== COORDINATE CONVERSION ====================
 
 /**
@@ -79,24 +126,59 @@ function decimalToDMS(decimal) {
   const absolute = Math.abs(decimal);
   
   // Tính degrees (phần nguyên)
-  const degrees = Math.floor(absolute);
+  let degrees = Math.floor(absolute);
   
   // Tính minutes
   const minutesFloat = (absolute - degrees) * 60;
-  const minutes = Math.floor(minutesFloat);
+  let minutes = Math.floor(minutesFloat);
+  
+  // Tính seconds, làm tròn 2 chữ số bằng số học (không qua chuỗi)
+  let seconds = Math.round((minutesFloat - minutes) * 6000) / 100;
   
-  // Tính seconds
-  const seconds = (minutesFloat - minutes) * 60;
+  // Làm tròn lên 60" thì nhớ sang phút/độ (tránh giá trị 60" không hợp lệ)
+  if (seconds >= 60) {
+    seconds = 0;
+    minutes += 1;
+    if (minutes >= 60) {
+      minutes = 0;
+      degrees += 1;
+    }
+  }
   
   return {
     degrees: sign * degrees,
     minutes: minutes,
-    seconds: parseFloat(seconds.toFixed(2))
+    seconds: seconds
   };
 }
 
 // ==================== GEODESIC CALCULATIONS ====================
 
+/**
+ * Lấy sin/cos của góc azimuth, ghi vào out[0] (sin) và out[1] (cos)
+ * 
+ * Azimuth độ nguyên trong [0, 360] tra AZIMUTH_SIN_TABLE/AZIMUTH_COS_TABLE,
+ * góc lẻ tính trực tiếp bằng Math.sin/Math.cos. Dùng chung cho bản scalar
+ * và bản batch để hai đường tính không lệch nhau; bản batch truyền vào
+ * một buffer dùng lại cho mọi điểm nên không cấp phát trong vòng lặp.
+ * 
+ * @param {number} azimuthDeg - Góc phương vị (degrees)
+ * @param {Float64Array} out - Buffer 2 phần tử nhận kết quả
+ * @returns {Float64Array} out
+ */
+function azimuthSinCos(azimuthDeg, out = new Float64Array(2)) {
+  if (Number.isInteger(azimuthDeg) && azimuthDeg >= 0 && azimuthDeg <= 360) {
+    out[0] = AZIMUTH_SIN_TABLE[azimuthDeg];
+    out[1] = AZIMUTH_COS_TABLE[azimuthDeg];
+    return out;
+  }
+  
+  const bearing = azimuthDeg * DEG_TO_RAD;
+  out[0] = Math.sin(bearing);
+  out[1] = Math.cos(bearing);
+  return out;
+}
+
 /**
  * Tính tọa độ điểm đích (destination point) sử dụng công thức Haversine
  * 
@@ -122,7 +204,9 @@ function calculateTargetCoordinate(lat, lon, azimuthDeg, distanceKm) {
   // Chuyển đổi sang radian
   const lat1 = lat * DEG_TO_RAD;
   const lon1 = lon * DEG_TO_RAD;
-  const bearing = azimuthDeg * DEG_TO_RAD;
+  
+  // sin/cos của bearing (tra bảng nếu azimuth là độ nguyên)
+  const [sinBearing, cosBearing] = azimuthSinCos(azimuthDeg);
   
   // Tính angular distance (góc ở tâm Trái Đất)
   const delta = distanceKm / EARTH_RADIUS_KM;
@@ -130,12 +214,12 @@ function calculateTargetCoordinate(lat, lon, azimuthDeg, distanceKm) {
   // Tính vĩ độ điểm đích
   const lat2 = Math.asin(
     Math.sin(lat1) * Math.cos(delta) +
-    Math.cos(lat1) * Math.sin(delta) * Math.cos(bearing)
+    Math.cos(lat1) * Math.sin(delta) * cosBearing
   );
   
   // Tính kinh độ điểm đích
   const lon2 = lon1 + Math.atan2(
-    Math.sin(bearing) * Math.sin(delta) * Math.cos(lat1),
+    sinBearing * Math.sin(delta) * Math.cos(lat1),
     Math.cos(delta) - Math.sin(lat1) * Math.sin(lat2)
   );
   
@@ -152,6 +236,62 @@ function calculateTargetCoordinate(lat, lon, azimuthDeg, distanceKm) {
   };
 }
 
+/**
+ * Phiên bản batch của calculateTargetCoordinate trên typed arrays
+ * 
+ * Tính N điểm đích trong một vòng lặp, ghi kết quả trực tiếp vào
+ * Float64Array — không tạo object {lat, lon} cho từng điểm.
+ * Không validate input; caller chịu trách nhiệm (xem calculateTargetsBatch).
+ * 
+ * @param {Float64Array} lats - Vĩ độ các điểm xuất phát (degrees)
+ * @param {Float64Array} lons - Kinh độ các điểm xuất phát (degrees)
+ * @param {Float64Array} azimuths - Góc phương vị (degrees)
+ * @param {Float64Array} distances - Khoảng cách (km)
+ * @returns {object} {lat: Float64Array, lon: Float64Array}
+ */
+function calculateTargetCoordinatesBatch(lats, lons, azimuths, distances) {
+  const n = lats.length;
+  const outLat = new Float64Array(n);
+  const outLon = new Float64Array(n);
+  
+  // Cache sin/cos vĩ độ quan sát viên: trong một lần quét tham số
+  // các dòng liên tiếp thường dùng chung vị trí quan sát viên
+  let cachedLat = NaN;
+  let sinLat1 = 0;
+  let cosLat1 = 1;
+  
+  // Buffer sin/cos bearing dùng lại cho mọi điểm
+  const bearingSinCos = new Float64Array(2);
+  
+  for (let i = 0; i < n; i++) {
+    if (lats[i] !== cachedLat) {
+      cachedLat = lats[i];
+      const lat1 = cachedLat * DEG_TO_RAD;
+      sinLat1 = Math.sin(lat1);
+      cosLat1 = Math.cos(lat1);
+    }
+    const lon1 = lons[i] * DEG_TO_RAD;
+    azimuthSinCos(azimuths[i], bearingSinCos);
+    const sinBearing = bearingSinCos[0];
+    const cosBearing = bearingSinCos[1];
+    
+    const delta = distances[i] / EARTH_RADIUS_KM;
+    const sinDelta = Math.sin(delta);
+    const cosDelta = Math.cos(delta);
+    
+    const lat2 = Math.asin(sinLat1 * cosDelta + cosLat1 * sinDelta * cosBearing);
+    const lon2 = lon1 + Math.atan2(
+      sinBearing * sinDelta * cosLat1,
+      cosDelta - sinLat1 * Math.sin(lat2)
+    );
+    
+    outLat[i] = lat2 * RAD_TO_DEG;
+    outLon[i] = ((lon2 * RAD_TO_DEG + 540) % 360) - 180;
+  }
+  
+  return { lat: outLat, lon: outLon };
+}
+
 /**
  * Tính khoảng cách giữa 2 điểm trên mặt cầu sử dụng công thức Haversine
  * 
@@ -179,11 +319,12 @@ function calculateDistance(lat1, lon1, lat2, lon2) {
   const Δφ = (lat2 - lat1) * DEG_TO_RAD;
   const Δλ = (lon2 - lon1) * DEG_TO_RAD;
   
-  // Công thức Haversine
+  // Công thức Haversine (mỗi sin(Δ/2) chỉ tính một lần rồi bình phương)
+  const sinHalfΔφ = Math.sin(Δφ / 2);
+  const sinHalfΔλ = Math.sin(Δλ / 2);
   const a = 
-    Math.sin(Δφ / 2) * Math.sin(Δφ / 2) +
-    Math.cos(φ1) * Math.cos(φ2) *
-    Math.sin(Δλ / 2) * Math.sin(Δλ / 2);
+    sinHalfΔφ * sinHalfΔφ +
+    Math.cos(φ1) * Math.cos(φ2) * sinHalfΔλ * sinHalfΔλ;
   
   const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
   
@@ -193,6 +334,24 @@ function calculateDistance(lat1, lon1, lat2, lon2) {
   return distance;
 }
 
+/**
+ * Chuẩn hóa góc từ atan2 (degrees, (-180, 180]) về khoảng [0, 360)
+ * 
+ * Không cần phép % vì đầu vào chỉ lệch tối đa một vòng: góc âm cộng 360,
+ * góc dương giữ nguyên (không mất bit do cộng rồi trừ 360). Góc âm cực nhỏ
+ * cộng 360 có thể làm tròn thành đúng 360 nên được đưa về 0.
+ * 
+ * @param {number} degrees - Góc trong khoảng (-180, 180]
+ * @returns {number} Góc trong khoảng [0, 360)
+ */
+function normalizeBearing(degrees) {
+  if (degrees >= 0) {
+    return degrees;
+  }
+  const wrapped = degrees + 360;
+  return wrapped < 360 ? wrapped : 0;
+}
+
 /**
  * Tính góc bearing (phương vị) từ điểm 1 đến điểm 2
  * 
@@ -212,11 +371,51 @@ function calculateBearing(lat1, lon1, lat2, lon2) {
             Math.sin(φ1) * Math.cos(φ2) * Math.cos(Δλ);
   
   const θ = Math.atan2(y, x);
-  const bearing = (θ * RAD_TO_DEG + 360) % 360;
+  const bearing = normalizeBearing(θ * RAD_TO_DEG);
   
   return bearing;
 }
 
+/**
+ * Tính đồng thời khoảng cách (Haversine) và bearing giữa 2 điểm
+ * 
+ * Kết quả giống hệt calculateDistance() + calculateBearing(), nhưng
+ * chuyển radian và tính cos φ₁, cos φ₂ chỉ một lần cho cả hai.
+ * 
+ * @param {number} lat1 - Vĩ độ điểm 1 (degrees)
+ * @param {number} lon1 - Kinh độ điểm 1 (degrees)
+ * @param {number} lat2 - Vĩ độ điểm 2 (degrees)
+ * @param {number} lon2 - Kinh độ điểm 2 (degrees)
+ * @returns {object} {distance (km), bearing (degrees, 0-360)}
+ */
+function calculateDistanceAndBearing(lat1, lon1, lat2, lon2) {
+  const φ1 = lat1 * DEG_TO_RAD;
+  const φ2 = lat2 * DEG_TO_RAD;
+  const Δφ = (lat2 - lat1) * DEG_TO_RAD;
+  const Δλ = (lon2 - lon1) * DEG_TO_RAD;
+  const cosφ1 = Math.cos(φ1);
+  const cosφ2 = Math.cos(φ2);
+  
+  // Khoảng cách (Haversine)
+  const sinHalfΔφ = Math.sin(Δφ / 2);
+  const sinHalfΔλ = Math.sin(Δλ / 2);
+  const a = 
+    sinHalfΔφ * sinHalfΔφ +
+    cosφ1 * cosφ2 * sinHalfΔλ * sinHalfΔλ;
+  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+  
+  // Bearing
+  const y = Math.sin(Δλ) * cosφ2;
+  const x = cosφ1 * Math.sin(φ2) -
+            Math.sin(φ1) * cosφ2 * Math.cos(Δλ);
+  const θ = Math.atan2(y, x);
+  
+  return {
+    distance: EARTH_RADIUS_KM * c,
+    bearing: normalizeBearing(θ * RAD_TO_DEG)
+  };
+}
+
 // ==================== VALIDATION ====================
 
 /**
@@ -227,7 +426,7 @@ function calculateBearing(lat1, lon1, lat2, lon2) {
  * - Kinh độ: -180 đến 180
  * - Azimuth: 0 đến 360
  * - Distance: > 0
- * - Warning: Distance > 100 km (độ chính xác giảm)
+ * - Warning: Distance > MAX_DISTANCE_KM (100 km, độ chính xác giảm)
  * 
  * @param {object} data - Object chứa {lat, lon, azimuth, distance}
  * @returns {string} Thông báo lỗi hoặc chuỗi rỗng nếu hợp lệ
@@ -265,8 +464,8 @@ function validateInput(data) {
   }
   
   // Cảnh báo nếu khoảng cách lớn
-  if (distance > 100) {
-    return 'Cảnh báo: Khoảng cách lớn (>100km) có thể làm giảm độ chính xác tính toán trên mô hình cầu';
+  if (distance > MAX_DISTANCE_KM) {
+    return `Cảnh báo: Khoảng cách lớn (>${MAX_DISTANCE_KM}km) có thể làm giảm độ chính xác tính toán trên mô hình cầu`;
   }
   
   // Kiểm tra NaN
@@ -278,6 +477,61 @@ function validateInput(data) {
   return '';
 }
 
+/**
+ * Kiểm tra nhanh một bộ input có hợp lệ hay không (không tạo thông báo)
+ * 
+ * Cùng điều kiện với validateInput() (kể cả ngưỡng MAX_DISTANCE_KM): trả về true
+ * khi và chỉ khi validateInput() trả về chuỗi rỗng. So sánh với NaN luôn
+ * false nên NaN tự động bị loại.
+ * 
+ * @param {number} lat - Vĩ độ
+ * @param {number} lon - Kinh độ
+ * @param {number} azimuth - Góc azimuth
+ * @param {number} distance - Khoảng cách (km)
+ * @returns {boolean} true nếu hợp lệ
+ */
+function isValidInput(lat, lon, azimuth, distance) {
+  return lat >= LAT_MIN && lat <= LAT_MAX &&
+         lon >= LON_MIN && lon <= LON_MAX &&
+         azimuth >= AZIMUTH_MIN && azimuth <= AZIMUTH_MAX &&
+         distance > 0 && distance <= MAX_DISTANCE_KM;
+}
+
+/**
+ * Validate dữ liệu batch dạng cột (xem parseBatchCSVColumns)
+ * 
+ * Duyệt một lượt bằng isValidInput(); chỉ tạo thông báo lỗi cho dòng
+ * không hợp lệ đầu tiên. Số dòng lấy từ `columns.line` (số dòng thực
+ * trong file, tính cả header/comment/dòng trống); nếu không có `line`
+ * thì thông báo dùng thứ tự phần tử (tính từ 1).
+ * 
+ * @param {object} columns - {observerLat, observerLon, azimuth, distance, line?}
+ * @returns {string} Thông báo lỗi (kèm vị trí) hoặc chuỗi rỗng nếu hợp lệ
+ * 
+ * @example
+ * const error = validateInputBatch(parseBatchCSVColumns(csvText));
+ * if (error) console.error(error); // "Dòng 3: Khoảng cách phải lớn hơn 0 km"
+ */
+function validateInputBatch(columns) {
+  const { observerLat, observerLon, azimuth, distance, line } = columns;
+  
+  for (let i = 0; i < observerLat.length; i++) {
+    if (!isValidInput(observerLat[i], observerLon[i], azimuth[i], distance[i])) {
+      const error = validateInput({
+        lat: observerLat[i],
+        lon: observerLon[i],
+        azimuth: azimuth[i],
+        distance: distance[i]
+      });
+      return line
+        ? `Dòng ${line[i]}: ${error}`
+        : `Phần tử ${i + 1}: ${error}`;
+    }
+  }
+  
+  return '';
+}
+
 /**
  * Validate DMS components
  * 
@@ -373,23 +627,11 @@ function formatDistance(distanceKm) {
  * formatAzimuth(45); // "45.0° (NE - Đông Bắc)"
  */
 function formatAzimuth(azimuth) {
-  const directions = [
-    { angle: 0, short: 'N', full: 'Bắc' },
-    { angle: 45, short: 'NE', full: 'Đông Bắc' },
-    { angle: 90, short: 'E', full: 'Đông' },
-    { angle: 135, short: 'SE', full: 'Đông Nam' },
-    { angle: 180, short: 'S', full: 'Nam' },
-    { angle: 225, short: 'SW', full: 'Tây Nam' },
-    { angle: 270, short: 'W', full: 'Tây' },
-    { angle: 315, short: 'NW', full: 'Tây Bắc' },
-    { angle: 360, short: 'N', full: 'Bắc' }
-  ];
-  
   // Tìm hướng gần nhất
-  let closestDir = directions[0];
-  let minDiff = Math.abs(azimuth - directions[0].angle);
+  let closestDir = CARDINAL_DIRECTIONS[0];
+  let minDiff = Math.abs(azimuth - CARDINAL_DIRECTIONS[0].angle);
   
-  for (const dir of directions) {
+  for (const dir of CARDINAL_DIRECTIONS) {
     const diff = Math.abs(azimuth - dir.angle);
     if (diff < minDiff) {
       minDiff = diff;
@@ -425,9 +667,9 @@ function estimateError(distanceKm, gpsError = 10, azimuthError = 0.5, distanceEr
   
   // Tổng hợp sai số (root sum square)
   const totalError = Math.sqrt(
-    Math.pow(gpsError, 2) +
-    Math.pow(azimuthErrorMeters, 2) +
-    Math.pow(distanceError, 2)
+    gpsError * gpsError +
+    azimuthErrorMeters * azimuthErrorMeters +
+    distanceError * distanceError
   );
   
   return totalError;
@@ -435,6 +677,30 @@ function estimateError(distanceKm, gpsError = 10, azimuthError = 0.5, distanceEr
 
 // ==================== MAIN CALCULATION FUNCTION ====================
 
+/**
+ * Tạo record tọa độ (decimal + formatted + DMS) cho một điểm
+ * 
+ * Observer và target luôn được tạo qua cùng một hàm nên có cùng
+ * thứ tự/tập thuộc tính — JS engine dùng chung một hidden class
+ * cho cả hai thay vì hai object literal có shape riêng.
+ * 
+ * @param {number} lat - Vĩ độ (decimal degrees)
+ * @param {number} lon - Kinh độ (decimal degrees)
+ * @returns {object} {lat, lon, latFormatted, lonFormatted, dms: {lat, lon}}
+ */
+function buildPointRecord(lat, lon) {
+  return {
+    lat: lat,
+    lon: lon,
+    latFormatted: formatDecimal(lat),
+    lonFormatted: formatDecimal(lon),
+    dms: {
+      lat: decimalToDMS(lat),
+      lon: decimalToDMS(lon)
+    }
+  };
+}
+
 /**
  * Hàm main để tính toán tọa độ mục tiêu
  * Bao gồm validation, calculation và formatting
@@ -483,21 +749,15 @@ function calculateTarget(input) {
       distance
     );
     
-    // Verify bằng cách tính ngược lại khoảng cách
-    const verifyDistance = calculateDistance(
-      observerLat,
-      observerLon,
-      target.lat,
-      target.lon
-    );
-    
-    // Tính bearing ngược lại để verify
-    const verifyBearing = calculateBearing(
+    // Verify bằng cách tính ngược lại khoảng cách và bearing
+    const verify = calculateDistanceAndBearing(
       observerLat,
       observerLon,
       target.lat,
       target.lon
     );
+    const verifyDistance = verify.distance;
+    const verifyBearing = verify.bearing;
     
     // Ước lượng sai số
     const estimatedError = estimateError(distance);
@@ -506,28 +766,10 @@ function calculateTarget(input) {
       success: true,
       data: {
         // Tọa độ quan sát viên
-        observer: {
-          lat: observerLat,
-          lon: observerLon,
-          latFormatted: formatDecimal(observerLat),
-          lonFormatted: formatDecimal(observerLon),
-          dms: {
-            lat: decimalToDMS(observerLat),
-            lon: decimalToDMS(observerLon)
-          }
-        },
+        observer: buildPointRecord(observerLat, observerLon),
         
         // Tọa độ mục tiêu
-        target: {
-          lat: target.lat,
-          lon: target.lon,
-          latFormatted: formatDecimal(target.lat),
-          lonFormatted: formatDecimal(target.lon),
-          dms: {
-            lat: decimalToDMS(target.lat),
-            lon: decimalToDMS(target.lon)
-          }
-        },
+        target: buildPointRecord(target.lat, target.lon),
         
         // Thông tin đo đạc
         measurement: {
@@ -561,6 +803,268 @@ function calculateTarget(input) {
   }
 }
 
+// ==================== BATCH CALCULATION ====================
+
+/**
+ * Số cột bắt buộc của mỗi dòng batch CSV
+ */
+const BATCH_CSV_FIELD_COUNT = 4;
+
+/**
+ * Chuyển một field CSV thành số
+ * 
+ * Khác Number(): field rỗng/toàn khoảng trắng trả về NaN thay vì 0,
+ * để dòng thiếu giá trị bị validation báo lỗi thay vì tính sai vị trí.
+ * 
+ * @param {string|undefined} field - Field CSV (undefined nếu dòng thiếu cột)
+ * @returns {number} Giá trị số hoặc NaN nếu không hợp lệ
+ */
+function parseCSVNumber(field) {
+  if (field === undefined || field.trim() === '') {
+    return NaN;
+  }
+  return Number(field);
+}
+
+/**
+ * Parse dữ liệu batch dạng CSV thẳng vào typed arrays (dạng cột)
+ * 
+ * Mỗi dòng: observerLat,observerLon,azimuth,distance
+ * Bỏ qua dòng trống, dòng comment (#) và một dòng header ở đầu
+ * (dòng không trống đầu tiên mà không có field nào là số).
+ * 
+ * Dòng lỗi (thiếu/thừa cột, field rỗng hoặc không phải số) KHÔNG bị bỏ
+ * qua: các giá trị của dòng đó là NaN, nên validation báo lỗi đúng vị trí
+ * và số phần tử luôn khớp số dòng dữ liệu trong file.
+ * 
+ * Không tạo object cho từng dòng: mỗi cột là một Float64Array, dùng trực
+ * tiếp với calculateTargetCoordinatesBatch().
+ * 
+ * @param {string} text - Nội dung CSV
+ * @returns {object} {observerLat, observerLon, azimuth, distance} (Float64Array)
+ *   và line (Int32Array): số dòng (tính từ 1) trong file của từng phần tử
+ * 
+ * @example
+ * const cols = parseBatchCSVColumns(csvText);
+ * const targets = calculateTargetCoordinatesBatch(
+ *   cols.observerLat, cols.observerLon, cols.azimuth, cols.distance
+ * );
+ */
+function parseBatchCSVColumns(text) {
+  const lines = text.split(/\r?\n/);
+  const observerLat = new Float64Array(lines.length);
+  const observerLon = new Float64Array(lines.length);
+  const azimuth = new Float64Array(lines.length);
+  const distance = new Float64Array(lines.length);
+  const lineNumbers = new Int32Array(lines.length);
+  let count = 0;
+  let headerChecked = false;
+  
+  for (let lineIndex = 0; lineIndex < lines.length; lineIndex++) {
+    const line = lines[lineIndex].trim();
+    if (!line || line.startsWith('#')) {
+      continue;
+    }
+    
+    const fields = line.split(',');
+    
+    // Chỉ dòng đầu tiên mới có thể là header (ví dụ: "lat,lon,azimuth,distance"),
+    // và chỉ khi không field nào là số — dòng dữ liệu lỗi vẫn được giữ lại
+    if (!headerChecked) {
+      headerChecked = true;
+      if (fields.every(field => isNaN(parseCSVNumber(field)))) {
+        continue;
+      }
+    }
+    
+    // Sai số cột: cả dòng không hợp lệ
+    if (fields.length !== BATCH_CSV_FIELD_COUNT) {
+      observerLat[count] = NaN;
+      observerLon[count] = NaN;
+      azimuth[count] = NaN;
+      distance[count] = NaN;
+    } else {
+      observerLat[count] = parseCSVNumber(fields[0]);
+      observerLon[count] = parseCSVNumber(fields[1]);
+      azimuth[count] = parseCSVNumber(fields[2]);
+      distance[count] = parseCSVNumber(fields[3]);
+    }
+    lineNumbers[count] = lineIndex + 1;
+    count++;
+  }
+  
+  return {
+    observerLat: observerLat.subarray(0, count),
+    observerLon: observerLon.subarray(0, count),
+    azimuth: azimuth.subarray(0, count),
+    distance: distance.subarray(0, count),
+    line: lineNumbers.subarray(0, count)
+  };
+}
+
+/**
+ * Parse dữ liệu batch dạng CSV thành danh sách input (dạng dòng)
+ * 
+ * Wrapper của parseBatchCSVColumns() (cùng quy tắc parse), trả về một
+ * object cho mỗi dòng để dùng với calculateTargetsBatch().
+ * 
+ * @param {string} text - Nội dung CSV
+ * @returns {object[]} Mảng {observerLat, observerLon, azimuth, distance, line}
+ * 
+ * @example
+ * const inputs = parseBatchCSV('10.762622,106.660172,45,2.5\n21.028511,105.804817,0,5');
+ */
+function parseBatchCSV(text) {
+  const columns = parseBatchCSVColumns(text);
+  const n = columns.observerLat.length;
+  const inputs = new Array(n);
+  
+  for (let i = 0; i < n; i++) {
+    inputs[i] = {
+      observerLat: columns.observerLat[i],
+      observerLon: columns.observerLon[i],
+      azimuth: columns.azimuth[i],
+      distance: columns.distance[i],
+      line: columns.line[i]
+    };
+  }
+  
+  return inputs;
+}
+
+/**
+ * Tính toán tọa độ mục tiêu cho nhiều input cùng lúc
+ * 
+ * Dùng cho quét tham số / benchmark mà không cần thao tác trên UI.
+ * Mặc định kết quả từng phần tử có cùng format với calculateTarget().
+ * Với `formatted: false`, bỏ qua verification và toàn bộ phần format
+ * chuỗi (decimal, DMS, azimuth...) — chỉ trả về số {lat, lon}.
+ * 
+ * `inputs` có thể là mảng object (dạng dòng) hoặc object dạng cột trả về
+ * từ parseBatchCSVColumns(). Với dạng cột và `formatted: false`, các cột
+ * được đưa thẳng vào calculateTargetCoordinatesBatch() mà không sao chép.
+ * 
+ * @param {object[]|object} inputs - Mảng input (xem calculateTarget) hoặc
+ *   {observerLat, observerLon, azimuth, distance} dạng cột
+ * @param {object} options - {formatted: boolean} (default: true)
+ * @returns {object[]} Mảng kết quả tương ứng theo thứ tự
+ * 
+ * @example
+ * const results = calculateTargetsBatch(parseBatchCSVColumns(csvText), { formatted: false });
+ * const failed = results.filter(r => !r.success);
+ */
+function calculateTargetsBatch(inputs, options = {}) {
+  const { formatted = true } = options;
+  const columnar = !Array.isArray(inputs);
+  const n = columnar ? inputs.observerLat.length : inputs.length;
+  
+  // Cấp phát trước mảng kết quả (đã biết số lượng input)
+  const results = new Array(n);
+  
+  if (formatted) {
+    for (let i = 0; i < n; i++) {
+      results[i] = calculateTarget(columnar ? {
+        observerLat: inputs.observerLat[i],
+        observerLon: inputs.observerLon[i],
+        azimuth: inputs.azimuth[i],
+        distance: inputs.distance[i]
+      } : inputs[i]);
+    }
+    return results;
+  }
+  
+  if (columnar) {
+    return calculateTargetsBatchColumns(inputs, results);
+  }
+  
+  // Bước 1: validate, gom các input hợp lệ vào typed arrays
+  const lats = new Float64Array(n);
+  const lons = new Float64Array(n);
+  const azimuths = new Float64Array(n);
+  const distances = new Float64Array(n);
+  const validIndices = new Int32Array(n);
+  let m = 0;
+  
+  for (let i = 0; i < n; i++) {
+    const { observerLat, observerLon, azimuth, distance } = inputs[i];
+    
+    // Chỉ tạo thông báo lỗi (validateInput) cho dòng không hợp lệ
+    if (!isValidInput(observerLat, observerLon, azimuth, distance)) {
+      results[i] = {
+        success: false,
+        error: validateInput({
+          lat: observerLat,
+          lon: observerLon,
+          azimuth: azimuth,
+          distance: distance
+        })
+      };
+      continue;
+    }
+    
+    lats[m] = observerLat;
+    lons[m] = observerLon;
+    azimuths[m] = azimuth;
+    distances[m] = distance;
+    validIndices[m] = i;
+    m++;
+  }
+  
+  // Bước 2: tính tất cả điểm đích trong một lần gọi
+  const targets = calculateTargetCoordinatesBatch(
+    lats.subarray(0, m),
+    lons.subarray(0, m),
+    azimuths.subarray(0, m),
+    distances.subarray(0, m)
+  );
+  
+  for (let k = 0; k < m; k++) {
+    results[validIndices[k]] = {
+      success: true,
+      data: { lat: targets.lat[k], lon: targets.lon[k] }
+    };
+  }
+  
+  return results;
+}
+
+/**
+ * Nhánh `formatted: false` của calculateTargetsBatch() cho input dạng cột
+ * 
+ * Tính toàn bộ các dòng trên chính các cột đầu vào (dòng không hợp lệ chỉ
+ * cho ra NaN và được thay bằng kết quả lỗi), không tạo typed array trung gian.
+ * 
+ * @param {object} columns - {observerLat, observerLon, azimuth, distance}
+ * @param {object[]} results - Mảng kết quả đã cấp phát (độ dài n)
+ * @returns {object[]} results
+ */
+function calculateTargetsBatchColumns(columns, results) {
+  const { observerLat, observerLon, azimuth, distance } = columns;
+  const targets = calculateTargetCoordinatesBatch(observerLat, observerLon, azimuth, distance);
+  
+  for (let i = 0; i < results.length; i++) {
+    if (!isValidInput(observerLat[i], observerLon[i], azimuth[i], distance[i])) {
+      results[i] = {
+        success: false,
+        error: validateInput({
+          lat: observerLat[i],
+          lon: observerLon[i],
+          azimuth: azimuth[i],
+          distance: distance[i]
+        })
+      };
+      continue;
+    }
+    
+    results[i] = {
+      success: true,
+      data: { lat: targets.lat[i], lon: targets.lon[i] }
+    };
+  }
+  
+  return results;
+}
+
 // ==================== EXPORT FOR BROWSER ====================
 
 /**
@@ -575,12 +1079,20 @@ if (typeof window !== 'undefined') {
     
     // Calculation functions
     calculateTargetCoordinate,
+    calculateTargetCoordinatesBatch,
     calculateDistance,
     calculateBearing,
+    calculateDistanceAndBearing,
     calculateTarget,
     
+    // Batch functions
+    parseBatchCSV,
+    parseBatchCSVColumns,
+    calculateTargetsBatch,
+    
     // Validation functions
     validateInput,
+    validateInputBatch,
     validateDMS,
     
     // Formatting functions
@@ -608,10 +1120,16 @@ if (typeof module !== 'undefined' && module.exports) {
     dmsToDecimal,
     decimalToDMS,
     calculateTargetCoordinate,
+    calculateTargetCoordinatesBatch,
     calculateDistance,
     calculateBearing,
+    calculateDistanceAndBearing,
     calculateTarget,
+    parseBatchCSV,
+    parseBatchCSVColumns,
+    calculateTargetsBatch,
     validateInput,
+    validateInputBatch,
     validateDMS,
     formatDecimal,
     formatDMS,
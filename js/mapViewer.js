@@ -39,6 +39,14 @@ let bearingLine = null;
  */
 let currentMode = 'decimal';
 
+/**
+ * Verbose mode: bật log chi tiết cho từng thao tác và console helpers.
+ * Mặc định bật trên localhost; host khác bật bằng
+ * localStorage.setItem('verbose', '1') (rồi reload) hoặc MapViewer.setVerbose(true)
+ * @type {boolean}
+ */
+let VERBOSE = readVerboseSetting();
+
 /**
  * Custom marker icons
  */
@@ -60,6 +68,77 @@ const BlueIcon = L.icon({
   shadowSize: [41, 41]
 });
 
+// ==================== DOM HELPERS ====================
+
+/**
+ * Cache tham chiếu DOM element theo id
+ * Các element của form/kết quả là tĩnh (không bị thay thế), nên chỉ cần
+ * getElementById một lần thay vì mỗi lần tính toán/toggle/hiện lỗi.
+ * @type {Map<string, HTMLElement>}
+ */
+const elementCache = new Map();
+
+/**
+ * Lấy DOM element theo id (có cache)
+ * 
+ * @param {string} id - ID của element
+ * @returns {HTMLElement|null} Element hoặc null nếu không tồn tại
+ */
+function getElement(id) {
+  let element = elementCache.get(id);
+  if (!element) {
+    element = document.getElementById(id);
+    if (element) {
+      elementCache.set(id, element);
+    }
+  }
+  return element;
+}
+
+// ==================== LOGGING ====================
+
+/**
+ * Đọc cấu hình verbose ban đầu: localhost hoặc localStorage 'verbose' = '1'
+ * 
+ * @returns {boolean} true nếu bật verbose
+ */
+function readVerboseSetting() {
+  if (typeof window === 'undefined') {
+    return false;
+  }
+  if (window.location.hostname === 'localhost') {
+    return true;
+  }
+  
+  // localStorage có thể bị chặn (private mode, cookie bị tắt...)
+  try {
+    return window.localStorage.getItem('verbose') === '1';
+  } catch (e) {
+    return false;
+  }
+}
+
+/**
+ * Bật/tắt verbose log trong phiên hiện tại
+ * 
+ * @param {boolean} enabled - true để bật log chi tiết
+ */
+function setVerbose(enabled) {
+  VERBOSE = Boolean(enabled);
+}
+
+/**
+ * Log debug cho từng thao tác, bỏ qua hoàn toàn khi VERBOSE = false
+ * (tránh format/serialize object lớn như kết quả tính toán mỗi lần bấm)
+ * 
+ * @param {...*} args - Tham số truyền cho console.log
+ */
+function debugLog(...args) {
+  if (VERBOSE) {
+    console.log(...args);
+  }
+}
+
 // ==================== MAP INITIALIZATION ====================
 
 /**
@@ -96,18 +175,12 @@ function initializeMap(containerId, lat, lon, zoom = 13) {
       title: 'Vị trí Quan sát viên'
     }).addTo(map);
     
-    observerMarker.bindPopup(`
-      <div style="font-size: 14px;">
-        <strong>🔴 Quan sát viên</strong><br>
-        Vĩ độ: ${lat.toFixed(6)}°<br>
-        Kinh độ: ${lon.toFixed(6)}°
-      </div>
-    `);
+    observerMarker.bindPopup(buildObserverPopupHtml(lat, lon));
     
     // Setup event handlers
     setupEventHandlers();
     
-    console.log('Map initialized successfully');
+    debugLog('Map initialized successfully');
     return map;
     
   } catch (error) {
@@ -119,6 +192,45 @@ function initializeMap(containerId, lat, lon, zoom = 13) {
 
 // ==================== MARKER MANAGEMENT ====================
 
+/**
+ * Tạo nội dung popup cho marker quan sát viên
+ * 
+ * @param {number} lat - Vĩ độ
+ * @param {number} lon - Kinh độ
+ * @returns {string} HTML popup
+ */
+function buildObserverPopupHtml(lat, lon) {
+  return `
+    <div style="font-size: 14px;">
+      <strong>🔴 Quan sát viên</strong><br>
+      Vĩ độ: ${lat.toFixed(6)}°<br>
+      Kinh độ: ${lon.toFixed(6)}°
+    </div>
+  `;
+}
+
+/**
+ * Tạo nội dung popup cho marker mục tiêu
+ * 
+ * @param {number} lat - Vĩ độ mục tiêu
+ * @param {number} lon - Kinh độ mục tiêu
+ * @param {number} distance - Khoảng cách từ quan sát viên (km)
+ * @param {number} azimuth - Góc phương vị (degrees)
+ * @returns {string} HTML popup
+ */
+function buildTargetPopupHtml(lat, lon, distance, azimuth) {
+  return `
+    <div style="font-size: 14px;">
+      <strong>🎯 Mục tiêu</strong><br>
+      Vĩ độ: ${lat.toFixed(6)}°<br>
+      Kinh độ: ${lon.toFixed(6)}°<br>
+      <hr style="margin: 8px 0;">
+      Khoảng cách: ${distance.toFixed(2)} km<br>
+      Phương vị: ${azimuth.toFixed(1)}°
+    </div>
+  `;
+}
+
 /**
  * Cập nhật vị trí marker quan sát viên
  * 
@@ -128,13 +240,7 @@ function initializeMap(containerId, lat, lon, zoom = 13) {
 function updateObserverMarker(lat, lon) {
   if (observerMarker) {
     observerMarker.setLatLng([lat, lon]);
-    observerMarker.setPopupContent(`
-      <div style="font-size: 14px;">
-        <strong>🔴 Quan sát viên</strong><br>
-        Vĩ độ: ${lat.toFixed(6)}°<br>
-        Kinh độ: ${lon.toFixed(6)}°
-      </div>
-    `);
+    observerMarker.setPopupContent(buildObserverPopupHtml(lat, lon));
   }
 }
 
@@ -150,16 +256,7 @@ function updateTargetMarker(lat, lon, distance, azimuth) {
   if (targetMarker) {
     // Cập nhật marker hiện tại
     targetMarker.setLatLng([lat, lon]);
-    targetMarker.setPopupContent(`
-      <div style="font-size: 14px;">
-        <strong>🎯 Mục tiêu</strong><br>
-        Vĩ độ: ${lat.toFixed(6)}°<br>
-        Kinh độ: ${lon.toFixed(6)}°<br>
-        <hr style="margin: 8px 0;">
-        Khoảng cách: ${distance.toFixed(2)} km<br>
-        Phương vị: ${azimuth.toFixed(1)}°
-      </div>
-    `);
+    targetMarker.setPopupContent(buildTargetPopupHtml(lat, lon, distance, azimuth));
     targetMarker.setOpacity(1);
   } else {
     // Tạo marker mới
@@ -168,16 +265,7 @@ function updateTargetMarker(lat, lon, distance, azimuth) {
       title: 'Vị trí Mục tiêu'
     }).addTo(map);
     
-    targetMarker.bindPopup(`
-      <div style="font-size: 14px;">
-        <strong>🎯 Mục tiêu</strong><br>
-        Vĩ độ: ${lat.toFixed(6)}°<br>
-        Kinh độ: ${lon.toFixed(6)}°<br>
-        <hr style="margin: 8px 0;">
-        Khoảng cách: ${distance.toFixed(2)} km<br>
-        Phương vị: ${azimuth.toFixed(1)}°
-      </div>
-    `);
+    targetMarker.bindPopup(buildTargetPopupHtml(lat, lon, distance, azimuth));
   }
   
   // Mở popup tự động
@@ -193,14 +281,17 @@ function updateTargetMarker(lat, lon, distance, azimuth) {
  * @param {number} tgtLon - Kinh độ mục tiêu
  */
 function drawBearingLine(obsLat, obsLon, tgtLat, tgtLon) {
-  // Xóa đường cũ nếu có
+  const latLngs = [[obsLat, obsLon], [tgtLat, tgtLon]];
+  
+  // Đã có đường: chỉ cập nhật tọa độ, giữ nguyên layer và tooltip
   if (bearingLine) {
-    map.removeLayer(bearingLine);
+    bearingLine.setLatLngs(latLngs);
+    return;
   }
   
   // Vẽ đường mới
   bearingLine = L.polyline(
-    [[obsLat, obsLon], [tgtLat, tgtLon]], 
+    latLngs, 
     {
       color: '#ef4444',
       weight: 3,
@@ -210,10 +301,7 @@ function drawBearingLine(obsLat, obsLon, tgtLat, tgtLon) {
     }
   ).addTo(map);
   
-  // Thêm tooltip ở giữa đường
-  const midLat = (obsLat + tgtLat) / 2;
-  const midLon = (obsLon + tgtLon) / 2;
-  
+  // Thêm tooltip ở giữa đường (direction 'center' tự đặt tại tâm đường)
   bearingLine.bindTooltip('Đường ngắm', {
     permanent: false,
     direction: 'center',
@@ -249,19 +337,19 @@ function fitMapToBounds(obsLat, obsLon, tgtLat, tgtLon) {
  */
 function setupEventHandlers() {
   // Mode toggle button
-  const toggleBtn = document.getElementById('toggleModeBtn');
+  const toggleBtn = getElement('toggleModeBtn');
   if (toggleBtn) {
     toggleBtn.addEventListener('click', handleModeToggle);
   }
   
   // Calculate button
-  const calcBtn = document.getElementById('calculateBtn');
+  const calcBtn = getElement('calculateBtn');
   if (calcBtn) {
     calcBtn.addEventListener('click', handleCalculate);
   }
   
   // Copy button
-  const copyBtn = document.getElementById('copyBtn');
+  const copyBtn = getElement('copyBtn');
   if (copyBtn) {
     copyBtn.addEventListener('click', handleCopyCoordinates);
   }
@@ -276,34 +364,32 @@ function setupEventHandlers() {
     });
   });
   
-  console.log('Event handlers setup complete');
+  debugLog('Event handlers setup complete');
 }
 
 /**
  * Xử lý khi toggle giữa Decimal và DMS mode
  */
 function handleModeToggle() {
-  const decimalInputs = document.getElementById('decimalInputs');
-  const dmsInputs = document.getElementById('dmsInputs');
-  const modeText = document.getElementById('modeText');
+  const decimalInputs = getElement('decimalInputs');
+  const dmsInputs = getElement('dmsInputs');
+  const modeText = getElement('modeText');
+  
+  // Lấy tọa độ hiện tại theo mode đang dùng
+  const { lat: latDec, lon: lonDec } = getCurrentCoordinates();
   
   if (currentMode === 'decimal') {
     // Chuyển sang DMS
-    // Lấy giá trị decimal hiện tại
-    const latDec = parseFloat(document.getElementById('latDecimal').value);
-    const lonDec = parseFloat(document.getElementById('lonDecimal').value);
-    
-    // Chuyển đổi sang DMS
     const latDMS = window.CoordinateCalculator.decimalToDMS(latDec);
     const lonDMS = window.CoordinateCalculator.decimalToDMS(lonDec);
     
     // Cập nhật DMS inputs
-    document.getElementById('latDeg').value = latDMS.degrees;
-    document.getElementById('latMin').value = latDMS.minutes;
-    document.getElementById('latSec').value = latDMS.seconds;
-    document.getElementById('lonDeg').value = lonDMS.degrees;
-    document.getElementById('lonMin').value = lonDMS.minutes;
-    document.getElementById('lonSec').value = lonDMS.seconds;
+    getElement('latDeg').value = latDMS.degrees;
+    getElement('latMin').value = latDMS.minutes;
+    getElement('latSec').value = latDMS.seconds;
+    getElement('lonDeg').value = lonDMS.degrees;
+    getElement('lonMin').value = lonDMS.minutes;
+    getElement('lonSec').value = lonDMS.seconds;
     
     // Toggle display
     decimalInputs.style.display = 'none';
@@ -313,21 +399,9 @@ function handleModeToggle() {
     
   } else {
     // Chuyển sang Decimal
-    // Lấy giá trị DMS hiện tại
-    const latDeg = parseFloat(document.getElementById('latDeg').value);
-    const latMin = parseFloat(document.getElementById('latMin').value);
-    const latSec = parseFloat(document.getElementById('latSec').value);
-    const lonDeg = parseFloat(document.getElementById('lonDeg').value);
-    const lonMin = parseFloat(document.getElementById('lonMin').value);
-    const lonSec = parseFloat(document.getElementById('lonSec').value);
-    
-    // Chuyển đổi sang Decimal
-    const latDec = window.CoordinateCalculator.dmsToDecimal(latDeg, latMin, latSec);
-    const lonDec = window.CoordinateCalculator.dmsToDecimal(lonDeg, lonMin, lonSec);
-    
     // Cập nhật Decimal inputs
-    document.getElementById('latDecimal').value = latDec.toFixed(6);
-    document.getElementById('lonDecimal').value = lonDec.toFixed(6);
+    getElement('latDecimal').value = latDec.toFixed(6);
+    getElement('lonDecimal').value = lonDec.toFixed(6);
     
     // Toggle display
     decimalInputs.style.display = 'flex';
@@ -346,26 +420,10 @@ function handleCalculate() {
   hideResult();
   
   // Lấy dữ liệu input
-  let observerLat, observerLon;
+  const { lat: observerLat, lon: observerLon } = getCurrentCoordinates();
   
-  if (currentMode === 'decimal') {
-    observerLat = parseFloat(document.getElementById('latDecimal').value);
-    observerLon = parseFloat(document.getElementById('lonDecimal').value);
-  } else {
-    // DMS mode
-    const latDeg = parseFloat(document.getElementById('latDeg').value);
-    const latMin = parseFloat(document.getElementById('latMin').value);
-    const latSec = parseFloat(document.getElementById('latSec').value);
-    const lonDeg = parseFloat(document.getElementById('lonDeg').value);
-    const lonMin = parseFloat(document.getElementById('lonMin').value);
-    const lonSec = parseFloat(document.getElementById('lonSec').value);
-    
-    observerLat = window.CoordinateCalculator.dmsToDecimal(latDeg, latMin, latSec);
-    observerLon = window.CoordinateCalculator.dmsToDecimal(lonDeg, lonMin, lonSec);
-  }
-  
-  const azimuth = parseFloat(document.getElementById('azimuth').value);
-  const distance = parseFloat(document.getElementById('distance').value);
+  const azimuth = parseFloat(getElement('azimuth').value);
+  const distance = parseFloat(getElement('distance').value);
   
   // Tính toán
   const result = window.CoordinateCalculator.calculateTarget({
@@ -410,15 +468,15 @@ function handleCalculate() {
  * Xử lý copy tọa độ vào clipboard
  */
 function handleCopyCoordinates() {
-  const latText = document.getElementById('resultLat').textContent;
-  const lonText = document.getElementById('resultLon').textContent;
+  const latText = getElement('resultLat').textContent;
+  const lonText = getElement('resultLon').textContent;
   
   const coordinates = `${latText}, ${lonText}`;
   
   // Copy to clipboard
   navigator.clipboard.writeText(coordinates).then(() => {
     // Thay đổi text button tạm thời
-    const copyBtn = document.getElementById('copyBtn');
+    const copyBtn = getElement('copyBtn');
     const originalHTML = copyBtn.innerHTML;
     copyBtn.innerHTML = '<span class="copy-icon">✅</span> Đã copy!';
     copyBtn.style.backgroundColor = '#d1fae5';
@@ -446,11 +504,11 @@ function handleCopyCoordinates() {
  * @param {object} data - Dữ liệu kết quả từ calculateTarget()
  */
 function displayResult(data) {
-  const resultSection = document.getElementById('resultSection');
-  const resultLat = document.getElementById('resultLat');
-  const resultLon = document.getElementById('resultLon');
-  const resultDistance = document.getElementById('resultDistance');
-  const resultAzimuth = document.getElementById('resultAzimuth');
+  const resultSection = getElement('resultSection');
+  const resultLat = getElement('resultLat');
+  const resultLon = getElement('resultLon');
+  const resultDistance = getElement('resultDistance');
+  const resultAzimuth = getElement('resultAzimuth');
   
   // Cập nhật nội dung
   resultLat.textContent = data.target.latFormatted;
@@ -464,14 +522,14 @@ function displayResult(data) {
   // Smooth scroll to result (if needed)
   resultSection.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
   
-  console.log('Result displayed:', data);
+  debugLog('Result displayed:', data);
 }
 
 /**
  * Ẩn kết quả
  */
 function hideResult() {
-  const resultSection = document.getElementById('resultSection');
+  const resultSection = getElement('resultSection');
   if (resultSection) {
     resultSection.style.display = 'none';
   }
@@ -483,8 +541,8 @@ function hideResult() {
  * @param {string} message - Nội dung lỗi
  */
 function showError(message) {
-  const errorDiv = document.getElementById('errorMessage');
-  const errorText = document.getElementById('errorText');
+  const errorDiv = getElement('errorMessage');
+  const errorText = getElement('errorText');
   
   if (errorDiv && errorText) {
     errorText.textContent = message;
@@ -501,7 +559,7 @@ function showError(message) {
  * Ẩn thông báo lỗi
  */
 function hideError() {
-  const errorDiv = document.getElementById('errorMessage');
+  const errorDiv = getElement('errorMessage');
   if (errorDiv) {
     errorDiv.style.display = 'none';
   }
@@ -518,15 +576,15 @@ function getCurrentCoordinates() {
   let lat, lon;
   
   if (currentMode === 'decimal') {
-    lat = parseFloat(document.getElementById('latDecimal').value);
-    lon = parseFloat(document.getElementById('lonDecimal').value);
+    lat = parseFloat(getElement('latDecimal').value);
+    lon = parseFloat(getElement('lonDecimal').value);
   } else {
-    const latDeg = parseFloat(document.getElementById('latDeg').value);
-    const latMin = parseFloat(document.getElementById('latMin').value);
-    const latSec = parseFloat(document.getElementById('latSec').value);
-    const lonDeg = parseFloat(document.getElementById('lonDeg').value);
-    const lonMin = parseFloat(document.getElementById('lonMin').value);
-    const lonSec = parseFloat(document.getElementById('lonSec').value);
+    const latDeg = parseFloat(getElement('latDeg').value);
+    const latMin = parseFloat(getElement('latMin').value);
+    const latSec = parseFloat(getElement('latSec').value);
+    const lonDeg = parseFloat(getElement('lonDeg').value);
+    const lonMin = parseFloat(getElement('lonMin').value);
+    const lonSec = parseFloat(getElement('lonSec').value);
     
     lat = window.CoordinateCalculator.dmsToDecimal(latDeg, latMin, latSec);
     lon = window.CoordinateCalculator.dmsToDecimal(lonDeg, lonMin, lonSec);
@@ -541,26 +599,27 @@ function getCurrentCoordinates() {
  * @param {object} testCase - Test case data
  */
 function loadTestCase(testCase) {
-  document.getElementById('latDecimal').value = testCase.observer.lat;
-  document.getElementById('lonDecimal').value = testCase.observer.lon;
-  document.getElementById('azimuth').value = testCase.azimuth;
-  document.getElementById('distance').value = testCase.distance;
+  getElement('latDecimal').value = testCase.observer.lat;
+  getElement('lonDecimal').value = testCase.observer.lon;
+  getElement('azimuth').value = testCase.azimuth;
+  getElement('distance').value = testCase.distance;
   
   // Switch to decimal mode if needed
   if (currentMode === 'dms') {
-    document.getElementById('toggleModeBtn').click();
+    getElement('toggleModeBtn').click();
   }
   
-  console.log('📋 Test case loaded:', testCase.name);
+  debugLog('📋 Test case loaded:', testCase.name);
 }
 
 /**
  * Export kết quả ra format text
  * 
  * @param {object} data - Dữ liệu kết quả
+ * @param {Date} timestamp - Thời điểm xuất (default: thời điểm gọi hàm)
  * @returns {string} Text formatted
  */
-function exportResultAsText(data) {
+function exportResultAsText(data, timestamp = new Date()) {
   return `
 === TỌA ĐỘ MỤC TIÊU ===
 
@@ -580,7 +639,7 @@ SAI SỐ ƯỚC LƯỢNG: ${data.estimatedError.formatted}
 
 ---
 Generated by Target Coordinate Calculator
-${new Date().toLocaleString('vi-VN')}
+${timestamp.toLocaleString('vi-VN')}
   `.trim();
 }
 
@@ -590,18 +649,20 @@ ${new Date().toLocaleString('vi-VN')}
  * @param {object} data - Dữ liệu kết quả
  */
 function downloadResult(data) {
-  const text = exportResultAsText(data);
+  // Dùng chung một timestamp cho nội dung file và tên file
+  const timestamp = new Date();
+  const text = exportResultAsText(data, timestamp);
   const blob = new Blob([text], { type: 'text/plain' });
   const url = URL.createObjectURL(blob);
   const a = document.createElement('a');
   a.href = url;
-  a.download = `target_coordinates_${Date.now()}.txt`;
+  a.download = `target_coordinates_${timestamp.getTime()}.txt`;
   document.body.appendChild(a);
   a.click();
   document.body.removeChild(a);
   URL.revokeObjectURL(url);
   
-  console.log('💾 Result downloaded');
+  debugLog('💾 Result downloaded');
 }
 
 // ==================== SAMPLE DATA & TESTING ====================
@@ -632,12 +693,15 @@ const SAMPLE_TEST_CASES = [
 
 /**
  * Load random test case (for testing)
+ * 
+ * @param {function} rng - Hàm sinh số ngẫu nhiên trong [0, 1) (default: Math.random).
+ *   Truyền generator có seed để chọn test case lặp lại được.
  */
-function loadRandomTestCase() {
-  const randomIndex = Math.floor(Math.random() * SAMPLE_TEST_CASES.length);
+function loadRandomTestCase(rng = Math.random) {
+  const randomIndex = Math.floor(rng() * SAMPLE_TEST_CASES.length);
   const testCase = SAMPLE_TEST_CASES[randomIndex];
   loadTestCase(testCase);
-  console.log('Random test case loaded');
+  debugLog('Random test case loaded');
 }
 
 // ==================== KEYBOARD SHORTCUTS ====================
@@ -661,7 +725,7 @@ function setupKeyboardShortcuts() {
     
     // Ctrl/Cmd + C (when result visible) = Copy coordinates
     if ((e.ctrlKey || e.metaKey) && e.key === 'c') {
-      const resultSection = document.getElementById('resultSection');
+      const resultSection = getElement('resultSection');
       if (resultSection && resultSection.style.display === 'block') {
         e.preventDefault();
         handleCopyCoordinates();
@@ -669,10 +733,10 @@ function setupKeyboardShortcuts() {
     }
   });
   
-  console.log('Keyboard shortcuts enabled');
-  console.log('  - Ctrl+Enter: Calculate');
-  console.log('  - Ctrl+M: Toggle Mode');
-  console.log('  - Ctrl+C: Copy Result');
+  debugLog('Keyboard shortcuts enabled');
+  debugLog('  - Ctrl+Enter: Calculate');
+  debugLog('  - Ctrl+M: Toggle Mode');
+  debugLog('  - Ctrl+C: Copy Result');
 }
 
 // ==================== INITIALIZATION ====================
@@ -681,7 +745,7 @@ function setupKeyboardShortcuts() {
  * Initialize everything when DOM is ready
  */
 document.addEventListener('DOMContentLoaded', function() {
-  console.log('MapViewer module initializing...');
+  debugLog('MapViewer module initializing...');
   
   // Setup keyboard shortcuts
   setupKeyboardShortcuts();
@@ -707,6 +771,7 @@ document.addEventListener('DOMContentLoaded', function() {
       loadRandomTestCase,
       exportResultAsText,
       downloadResult,
+      setVerbose,
       
       // Data
       SAMPLE_TEST_CASES,
@@ -749,7 +814,7 @@ if (typeof module !== 'undefined' && module.exports) {
  * Console helper để test nhanh
  * Chỉ available trong development mode
  */
-if (typeof window !== 'undefined' && window.location.hostname === 'localhost') {
+if (VERBOSE) {
   console.log('');
   console.log('🛠️  DEVELOPMENT MODE - Console Helpers Available:');
   console.log('');
@@ -757,6 +822,7 @@ if (typeof window !== 'undefined' && window.location.hostname === 'localhost') {
   console.log('MapViewer.loadTestCase(tc)      - Load specific test case');
   console.log('MapViewer.getCurrentCoordinates() - Get current input coords');
   console.log('MapViewer.SAMPLE_TEST_CASES      - View all test cases');
+  console.log('MapViewer.setVerbose(false)      - Turn off verbose logging');
   console.log('');
   console.log('Example:');
   console.log('  MapViewer.loadTestCase(MapViewer.SAMPLE_TEST_CASES[0])');